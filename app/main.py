@@ -8,20 +8,27 @@ FastAPI 假日查询服务（自动从 GitHub 拉取 JSON，带每日定时刷
 
 import os
 import re
-import json
 import time
+import logging
+import hashlib
+import functools
+import asyncio
 import threading
-import requests
-import pandas as pd
-from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+import aiohttp
+import orjson
+import pickle
+from datetime import date, datetime
+from multidict import CIMultiDictProxy
+from email.utils import parsedate_to_datetime
+from typing import List, Dict, Any, Mapping, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI, Query
-from fastapi.responses import JSONResponse, RedirectResponse
+from fastapi.responses import JSONResponse, ORJSONResponse, RedirectResponse
 from fastapi.staticfiles import StaticFiles
-from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from pydantic import BaseModel
 
 # ===================== 目录与环境 =====================
@@ -48,86 +55,188 @@ SCHED_MIN = int(os.environ.get("REFRESH_MIN", "0"))
 
 FOLDER_PATH = str(Path(FOLDER_PATH).resolve())
 SHA_INDEX_FILE = str(Path(FOLDER_PATH) / ".sha_index.json")
+LOOKUP_CACHE_FILE = str(Path(FOLDER_PATH) / ".lookup_cache.pkl")
+LOOKUP_CACHE_KEY_FILE = str(Path(FOLDER_PATH) / ".lookup_cache.key")
 
 # 请求超时（秒）
 LIST_TIMEOUT = 8
 GET_TIMEOUT = 15
 
+# ===================== 日志 =====================
+log = logging.getLogger("holiday")
+log.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
+
 # ===================== 全局状态 =====================
-df: Optional[pd.DataFrame] = None
-_df_lock = threading.Lock()
-_session = requests.Session()
-scheduler = BackgroundScheduler(timezone=SCHED_TZ)
+_lookup: Dict[str, Dict[str, Any]] = {}
+_year_min: Optional[int] = None
+_year_max: Optional[int] = None
+_data_lock = threading.Lock()
+_aio_session: Optional[aiohttp.ClientSession] = None
+_fetch_semaphore = asyncio.Semaphore(5)   # 并发下载上限
+scheduler = AsyncIOScheduler(timezone=SCHED_TZ)
 
 # ===================== 小工具 =====================
-def _gh_headers() -> Dict[str, str]:
-    headers = {
-        "Accept": "application/vnd.github+json",
-        "User-Agent": "holiday-cn-fastapi-fetcher",
-    }
-    if GH_TOKEN:
-        headers["Authorization"] = f"Bearer {GH_TOKEN}"
-    return headers
-
-def _load_sha_index() -> Dict[str, str]:
+# 请求头在进程生命周期内不变，构建一次即可
+_GH_HEADERS: Dict[str, str] = {
+    "Accept": "application/vnd.github+json",
+    "User-Agent": "holiday-cn-fastapi-fetcher",
+    **({"Authorization": f"Bearer {GH_TOKEN}"} if GH_TOKEN else {}),
+}
+
+def _load_sha_index() -> Dict[str, Any]:
     p = Path(SHA_INDEX_FILE)
     if p.exists():
         try:
-            return json.loads(p.read_text(encoding="utf-8"))
+            return orjson.loads(p.read_bytes())
         except Exception:
             return {}
     return {}
 
-def _save_sha_index(idx: Dict[str, str]) -> None:
+def _save_sha_index(idx: Dict[str, Any]) -> None:
     Path(FOLDER_PATH).mkdir(parents=True, exist_ok=True)
-    Path(SHA_INDEX_FILE).write_text(json.dumps(idx, ensure_ascii=False, indent=2), encoding="utf-8")
+    Path(SHA_INDEX_FILE).write_bytes(orjson.dumps(idx, option=orjson.OPT_INDENT_2))
+
+def _index_entry(sha_index: Dict[str, Any], name: str) -> Dict[str, str]:
+    ent = sha_index.get(name)
+    if isinstance(ent, str):   # 兼容旧版扁平格式（仅存 sha 字符串）
+        ent = {"sha": ent}
+    return ent or {}
+
+def _conditional_headers(ent: Dict[str, str]) -> Dict[str, str]:
+    headers: Dict[str, str] = {}
+    if ent.get("etag"):
+        headers["If-None-Match"] = ent["etag"]
+    if ent.get("last_modified"):
+        headers["If-Modified-Since"] = ent["last_modified"]
+    return headers
 
 def _is_year_json(name: str) -> bool:
-    if name.startswith("._"):
-        return False
-    return re.fullmatch(r"\d{4}\.json", name) is not None
+    # 纯字符串判断，比正则快一个量级（每次刷新对目录里每个条目都要调用）
+    return (
+        len(name) == 9
+        and not name.startswith("._")
+        and name[:4].isdigit()
+        and name.endswith(".json")
+    )
 
 def _year_range_for_fallback() -> List[int]:
-    this_year = datetime.now().year
+    this_year = date.today().year
     return list(range(2007, this_year + 2))
 
-def _sleep_backoff(attempt: int) -> None:
-    time.sleep(min(2 ** (attempt - 1), 4))
+async def _sleep_backoff(attempt: int) -> None:
+    await asyncio.sleep(min(2 ** (attempt - 1), 4))
 
-# ===================== 网络获取：带重试与回退 =====================
-def _http_get(url: str, headers: Dict[str, str], timeout: int) -> Optional[requests.Response]:
-    for attempt in range(1, 4):
+def _rate_limit_delay(headers: Mapping[str, str]) -> Optional[float]:
+    """从 Retry-After / X-RateLimit-Reset 读出服务端建议的等待秒数，没有则返回 None。"""
+    retry_after = headers.get("Retry-After")
+    if retry_after:
         try:
-            r = _session.get(url, headers=headers, timeout=timeout)
-            if r.status_code == 200:
-                return r
-            if r.status_code == 404:
-                return None
-            print(f"⚠️ GET {url} -> {r.status_code}（第{attempt}次）")
-        except Exception as e:
-            print(f"⚠️ GET 异常（第{attempt}次）: {e}")
-        _sleep_backoff(attempt)
+            return float(retry_after)
+        except ValueError:
+            try:
+                return (parsedate_to_datetime(retry_after) - datetime.now().astimezone()).total_seconds()
+            except Exception:
+                pass
+    if headers.get("X-RateLimit-Remaining") == "0":
+        reset = headers.get("X-RateLimit-Reset")
+        if reset:
+            try:
+                return int(reset) - time.time()
+            except ValueError:
+                pass
     return None
 
-def _download_to(dst_path: str, content: bytes) -> None:
+# ===================== 网络获取：带重试与回退 =====================
+async def _get_aio_session() -> aiohttp.ClientSession:
+    # 复用同一个 ClientSession（连接池跨多次刷新共享）
+    global _aio_session
+    if _aio_session is None or _aio_session.closed:
+        _aio_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=16,
+                limit_per_host=8,
+                ttl_dns_cache=300,       # 同一批域名反复解析没有意义
+                keepalive_timeout=30,    # 刷新期间的连续请求复用连接
+            )
+        )
+    return _aio_session
+
+async def _close_aio_session() -> None:
+    global _aio_session
+    if _aio_session is not None and not _aio_session.closed:
+        await _aio_session.close()
+    _aio_session = None
+
+async def _stream_to_file(resp: "aiohttp.ClientResponse", dst_path: str) -> None:
+    # 分块直写磁盘，避免把整个响应体攒在内存里；写完再原子替换到位
     p = Path(dst_path)
     p.parent.mkdir(parents=True, exist_ok=True)
-    p.write_bytes(content)
+    tmp = p.with_name(p.name + ".part")
+    with open(tmp, "wb") as f:
+        async for chunk in resp.content.iter_chunked(1 << 16):
+            f.write(chunk)
+    os.replace(tmp, p)
+
+async def _http_get(
+    url: str,
+    headers: Dict[str, str],
+    timeout: int,
+    extra_headers: Optional[Dict[str, str]] = None,
+    dst_path: Optional[str] = None,
+) -> Optional[Tuple[int, "CIMultiDictProxy[str]", Optional[bytes]]]:
+    """成功返回 (status, 响应头, body)；304 时 body 为 None；404/重试耗尽返回 None。
+
+    响应头保持 aiohttp 的大小写不敏感 multidict，取 ETag 等字段不依赖线上大小写。
+    传入 dst_path 时响应体流式写入该文件，body 返回 None。
+    """
+    session = await _get_aio_session()
+    if extra_headers:
+        headers = {**headers, **extra_headers}
+    for attempt in range(1, 4):
+        try:
+            async with session.get(
+                url, headers=headers, timeout=aiohttp.ClientTimeout(total=timeout)
+            ) as r:
+                if r.status == 200:
+                    if dst_path is None:
+                        return r.status, r.headers, await r.read()
+                    await _stream_to_file(r, dst_path)
+                    return r.status, r.headers, None
+                if r.status == 304:
+                    return r.status, r.headers, None
+                if r.status == 404:
+                    return None
+                if r.status in (403, 429):
+                    delay = _rate_limit_delay(r.headers)
+                    if delay is not None:
+                        if delay > 60:
+                            # 限流窗口太久，别浪费重试预算，直接放弃让上层走回退
+                            log.warning("GET %s -> %s，限流 %.0fs，放弃重试", url, r.status, delay)
+                            return None
+                        delay = max(delay, 1.0)
+                        log.warning("GET %s -> %s，按限流头等待 %.0fs（第%s次）", url, r.status, delay, attempt)
+                        await asyncio.sleep(delay)
+                        continue
+                log.warning("GET %s -> %s（第%s次）", url, r.status, attempt)
+        except Exception as e:
+            log.warning("GET 异常（第%s次）: %s", attempt, e)
+        await _sleep_backoff(attempt)
+    return None
 
-def _gh_list_contents() -> Optional[List[Dict[str, Any]]]:
+async def _gh_list_contents() -> Optional[List[Dict[str, Any]]]:
     try:
         base = f"https://api.github.com/repos/{GH_OWNER}/{GH_REPO}/contents"
         url = f"{base}/{GH_PATH}?ref={GH_BRANCH}" if GH_PATH else f"{base}?ref={GH_BRANCH}"
-        resp = _http_get(url, headers=_gh_headers(), timeout=LIST_TIMEOUT)
-        if not resp:
+        res = await _http_get(url, headers=_GH_HEADERS, timeout=LIST_TIMEOUT)
+        if not res or not res[2]:
             return None
-        data = resp.json()
+        data = orjson.loads(res[2])
         return data if isinstance(data, list) else [data]
     except Exception as e:
-        print(f"⚠️ GitHub 列目录失败：{e}")
+        log.warning("GitHub 列目录失败：%s", e)
         return None
 
-def _try_download_via_download_url(item: Dict[str, Any], sha_index: Dict[str, str], force: bool) -> bool:
+async def _try_download_via_download_url(item: Dict[str, Any], sha_index: Dict[str, Any], force: bool) -> bool:
     name = item.get("name")
     sha = item.get("sha")
     download_url = item.get("download_url")
@@ -135,79 +244,178 @@ def _try_download_via_download_url(item: Dict[str, Any], sha_index: Dict[str, st
         return False
 
     local_file = str(Path(FOLDER_PATH) / name)
-    need = force or (sha_index.get(name) != sha) or (not Path(local_file).exists())
+    ent = _index_entry(sha_index, name)
+    need = force or (ent.get("sha") != sha) or (not Path(local_file).exists())
     if not need:
         return False
 
-    resp = _http_get(download_url, headers=_gh_headers(), timeout=GET_TIMEOUT)
-    if not resp:
+    # 本地已有文件时带上缓存校验头，未变化则收到 304、省掉响应体
+    extra = _conditional_headers(ent) if (not force and Path(local_file).exists()) else None
+    async with _fetch_semaphore:
+        res = await _http_get(
+            download_url, headers=_GH_HEADERS, timeout=GET_TIMEOUT,
+            extra_headers=extra, dst_path=local_file,
+        )
+    if not res:
         return False
 
-    _download_to(local_file, resp.content)
-    sha_index[name] = sha or ""
-    print(f"✅ 通过 API 下载完成：{name}")
+    status, resp_headers, _ = res
+    if status == 304:
+        ent["sha"] = sha or ""
+        sha_index[name] = ent
+        log.info("未变化（304）：%s", name)
+        return False
+
+    sha_index[name] = {
+        "sha": sha or "",
+        "etag": resp_headers.get("ETag", ""),
+        "last_modified": resp_headers.get("Last-Modified", ""),
+    }
+    log.info("通过 API 下载完成：%s", name)
     return True
 
-def _try_download_via_direct_urls(year: int) -> bool:
-    inner = f"{GH_PATH}/{year}.json" if GH_PATH else f"{year}.json"
+async def _try_download_via_direct_urls(year: int, sha_index: Dict[str, Any], force: bool = False) -> bool:
+    name = f"{year}.json"
+    inner = f"{GH_PATH}/{name}" if GH_PATH else name
     urls = [
         f"https://raw.githubusercontent.com/{GH_OWNER}/{GH_REPO}/{GH_BRANCH}/{inner}",
         f"https://cdn.jsdelivr.net/gh/{GH_OWNER}/{GH_REPO}@{GH_BRANCH}/{inner}",
     ]
-    for u in urls:
-        resp = _http_get(u, headers=_gh_headers(), timeout=GET_TIMEOUT)
-        if resp:
-            local_file = str(Path(FOLDER_PATH) / f"{year}.json")
-            _download_to(local_file, resp.content)
-            print(f"✅ 直链下载完成：{year}.json ← {u}")
+    local_file = str(Path(FOLDER_PATH) / name)
+    ent = _index_entry(sha_index, name)
+    extra = _conditional_headers(ent) if (not force and Path(local_file).exists()) else None
+    async with _fetch_semaphore:
+        for u in urls:
+            res = await _http_get(
+                u, headers=_GH_HEADERS, timeout=GET_TIMEOUT,
+                extra_headers=extra, dst_path=local_file,
+            )
+            if not res:
+                continue
+            status, resp_headers, _ = res
+            if status == 304:
+                log.info("未变化（304）：%s", name)
+                return False
+            ent["etag"] = resp_headers.get("ETag", "")
+            ent["last_modified"] = resp_headers.get("Last-Modified", "")
+            sha_index[name] = ent
+            log.info("直链下载完成：%s ← %s", name, u)
             return True
-    print(f"❌ 直链下载失败：{year}.json")
+    log.warning("直链下载失败：%s", name)
     return False
 
+async def _head_year_exists(year: int) -> Optional[int]:
+    inner = f"{GH_PATH}/{year}.json" if GH_PATH else f"{year}.json"
+    url = f"https://raw.githubusercontent.com/{GH_OWNER}/{GH_REPO}/{GH_BRANCH}/{inner}"
+    session = await _get_aio_session()
+    try:
+        async with session.head(
+            url, headers=_GH_HEADERS,
+            timeout=aiohttp.ClientTimeout(total=LIST_TIMEOUT), allow_redirects=True,
+        ) as r:
+            return year if r.status == 200 else None
+    except Exception:
+        return None
+
+async def _enumerate_years_via_head() -> Optional[List[int]]:
+    """用廉价的 HEAD 请求探测 raw 直链上实际存在的年份文件。"""
+    results = await asyncio.gather(*(_head_year_exists(y) for y in _year_range_for_fallback()))
+    years = [y for y in results if y is not None]
+    return years or None
+
 # ===================== 拉取主流程 =====================
-def fetch_all_year_jsons(force: bool = False) -> bool:
+async def fetch_all_year_jsons(force: bool = False) -> bool:
     changed = False
     sha_index = _load_sha_index()
 
-    items = _gh_list_contents()
+    # 两种列举策略并发竞速（对冲请求）：谁先出结果用谁，输家直接取消，
+    # GitHub API 偶发变慢时不用等满 3 次 LIST_TIMEOUT 才回退
+    list_task = asyncio.create_task(_gh_list_contents())
+    head_task = asyncio.create_task(_enumerate_years_via_head())
+    items: Optional[List[Dict[str, Any]]] = None
+    years: Optional[List[int]] = None
+    pending = {list_task, head_task}
+    while pending and not items and not years:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        if list_task in done:
+            items = list_task.result()
+        if head_task in done:
+            years = head_task.result()
+    for t in pending:
+        t.cancel()
+
     if items:
-        for it in items:
-            name = it.get("name", "")
-            if not _is_year_json(name):
-                continue
-            ok = _try_download_via_download_url(it, sha_index, force=force)
-            changed = changed or ok
+        tasks = [
+            _try_download_via_download_url(it, sha_index, force=force)
+            for it in items
+            if _is_year_json(it.get("name", ""))
+        ]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        for res in results:
+            if isinstance(res, Exception):
+                log.warning("下载任务异常：%s", res)
+            else:
+                changed = changed or res
         _save_sha_index(sha_index)
         return changed
 
-    print("ℹ️ 列目录不可用，切换到按年份直链下载模式…")
-    for y in _year_range_for_fallback():
-        local_file = Path(FOLDER_PATH) / f"{y}.json"
-        if local_file.exists() and not force:
+    if years:
+        log.info("HEAD 枚举先到：%s 个年份文件，走直链下载", len(years))
+    else:
+        log.info("列目录不可用，切换到按年份直链下载模式…")
+    tasks = []
+    for y in (years or _year_range_for_fallback()):
+        exists = (Path(FOLDER_PATH) / f"{y}.json").exists()
+        # 已有文件且无缓存校验信息时跳过；有 ETag/Last-Modified 则用 304 廉价复验
+        if exists and not force and not _conditional_headers(_index_entry(sha_index, f"{y}.json")):
             continue
-        if _try_download_via_direct_urls(y):
-            changed = True
+        tasks.append(_try_download_via_direct_urls(y, sha_index, force=force))
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    for res in results:
+        if isinstance(res, Exception):
+            log.warning("下载任务异常：%s", res)
+        else:
+            changed = changed or res
 
     _save_sha_index(sha_index)
     return changed
 
-# ===================== DataFrame 构建 =====================
-def build_dataframe() -> pd.DataFrame:
+# ===================== 查询表构建 =====================
+# 行值常量：全表只引用这几个单例，避免上万份重复字符串
+TYPE_WORK = "工作日"
+TYPE_OFF = "法定节假日"
+TYPE_MAKEUP = "调休补班日"
+TYPE_WEEKEND = "周末休息"
+FEST_NONE = "无"
+RAW_WORK = "工作日"
+RAW_WEEKEND = "周末"
+WEEKDAY_NAMES = ("周一", "周二", "周三", "周四", "周五", "周六", "周日")
+
+def _load_year_json(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read()) or {}
+    except Exception as e:
+        log.warning("读取失败：%s，原因：%s", os.path.basename(path), e)
+        return None
+
+def build_lookup() -> Tuple[Dict[str, Dict[str, Any]], Optional[int], Optional[int]]:
+    """构建 date -> 记录 的查询表，返回 (lookup, 最小年份, 最大年份)。"""
     holiday_map_local: Dict[str, Dict[str, Any]] = {}
     years_local: List[int] = []
 
-    folder = Path(FOLDER_PATH)
-    if not folder.is_dir():
+    if not os.path.isdir(FOLDER_PATH):
         raise RuntimeError(f"本地目录不存在：{FOLDER_PATH}")
 
-    for p in folder.iterdir():
-        name = p.name
-        if not name.endswith(".json") or not name[:4].isdigit() or name.startswith("._"):
-            continue
-        try:
-            data = json.loads(p.read_text(encoding="utf-8")) or {}
-        except Exception as e:
-            print(f"⚠️ 读取失败：{name}，原因：{e}")
+    # scandir 直接给出 name/path，过滤阶段不 stat、不构造 Path 对象
+    with os.scandir(FOLDER_PATH) as it:
+        entries = [(e.name, e.path) for e in it if _is_year_json(e.name)]
+    # 读文件释放 GIL，用线程池让 ~20 个小文件的 I/O 重叠
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        parsed = list(ex.map(_load_year_json, (path for _, path in entries)))
+
+    for (name, _), data in zip(entries, parsed):
+        if data is None:
             continue
         days = data.get("days", [])
         if not days:
@@ -223,130 +431,151 @@ def build_dataframe() -> pd.DataFrame:
                 "isOffDay": bool(day.get("isOffDay", False)),
             }
 
-    results: List[Dict[str, Any]] = []
-    for year in sorted(set(years_local)):
-        current = datetime(year, 1, 1)
-        end_date = datetime(year, 12, 31)
-        while current <= end_date:
-            date_str = current.strftime("%Y-%m-%d")
-            weekday = current.weekday()
-            weekday_str = ["周一", "周二", "周三", "周四", "周五", "周六", "周日"][weekday]
-
-            if date_str in holiday_map_local:
-                info = holiday_map_local[date_str]
+    years = sorted(set(years_local))
+    if not years:
+        return {}, None, None
+
+    lookup: Dict[str, Dict[str, Any]] = {}
+    for year in years:
+        # 序数计数 + f-string 拼日期，全程 C 实现的 date 运算，不经过 strftime
+        for o in range(date(year, 1, 1).toordinal(), date(year, 12, 31).toordinal() + 1):
+            d = date.fromordinal(o)
+            date_str = f"{d.year:04d}-{d.month:02d}-{d.day:02d}"
+            weekday = d.weekday()
+
+            info = holiday_map_local.get(date_str)
+            if info is not None:
                 is_off = info["isOffDay"]
                 raw_name = info["name"]
                 if is_off:
-                    type_name = "法定节假日"
-                    festival = raw_name
+                    type_name, festival = TYPE_OFF, raw_name
+                elif weekday >= 5:
+                    type_name, festival = TYPE_MAKEUP, raw_name
                 else:
-                    if weekday >= 5:
-                        type_name = "调休补班日"
-                        festival = raw_name
-                    else:
-                        type_name = "工作日"
-                        festival = "无"
+                    type_name, festival = TYPE_WORK, FEST_NONE
+            elif weekday >= 5:
+                type_name, raw_name, is_off, festival = TYPE_WEEKEND, RAW_WEEKEND, True, FEST_NONE
             else:
-                if weekday >= 5:
-                    type_name = "周末休息"
-                    raw_name = "周末"
-                    is_off = True
-                    festival = "无"
-                else:
-                    type_name = "工作日"
-                    raw_name = "工作日"
-                    is_off = False
-                    festival = "无"
+                type_name, raw_name, is_off, festival = TYPE_WORK, RAW_WORK, False, FEST_NONE
 
-            results.append({
+            lookup[date_str] = {
                 "date": date_str,
                 "raw_name": raw_name,
-                "is_off_day": bool(is_off),
-                "weekday": weekday_str,
+                "is_off_day": is_off,
+                "weekday": WEEKDAY_NAMES[weekday],
                 "type": type_name,
                 "festival": festival,
-                "year": year
-            })
-            current += timedelta(days=1)
+                "year": year,
+            }
+    return lookup, years[0], years[-1]
 
-    df_local = pd.DataFrame(results)
-    if not df_local.empty:
-        df_local.set_index("date", inplace=True)
-    else:
-        df_local = pd.DataFrame(columns=["raw_name","is_off_day","weekday","type","festival","year"])
-        df_local.index.name = "date"
-    return df_local
+# ===================== 查询表磁盘缓存 =====================
+def _sha_index_cache_key(sha_index: Dict[str, Any]) -> str:
+    return hashlib.sha256(orjson.dumps(sha_index, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+def _save_lookup_cache(state: Tuple[Dict[str, Dict[str, Any]], Optional[int], Optional[int]]) -> None:
+    try:
+        with open(LOOKUP_CACHE_FILE, "wb") as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        Path(LOOKUP_CACHE_KEY_FILE).write_text(_sha_index_cache_key(_load_sha_index()), encoding="utf-8")
+    except Exception as e:
+        log.warning("写入查询表缓存失败（不影响服务）：%s", e)
+
+def _load_lookup_cache() -> Optional[Tuple[Dict[str, Dict[str, Any]], Optional[int], Optional[int]]]:
+    """源 JSON 未变化时直接读回上次构建的查询表，跳过重建。"""
+    try:
+        key_path = Path(LOOKUP_CACHE_KEY_FILE)
+        if not key_path.exists() or not Path(LOOKUP_CACHE_FILE).exists():
+            return None
+        if key_path.read_text(encoding="utf-8").strip() != _sha_index_cache_key(_load_sha_index()):
+            return None
+        with open(LOOKUP_CACHE_FILE, "rb") as f:
+            return pickle.load(f)
+    except Exception as e:
+        log.warning("读取查询表缓存失败，转为重建：%s", e)
+        return None
 
 # ===================== 业务方法 =====================
+# 只做格式校验即可：2025-02-30 之类的非法日期反正不会命中查询表
+_DATE_RE = re.compile(r"\A\d{4}-\d{2}-\d{2}\Z")
+
+def _swap_data(state: Tuple[Dict[str, Dict[str, Any]], Optional[int], Optional[int]]) -> None:
+    global _lookup, _year_min, _year_max
+    with _data_lock:
+        _lookup, _year_min, _year_max = state
+    _compute_info.cache_clear()   # 换数据后丢弃旧响应
+
+@functools.lru_cache(maxsize=16384)
+def _compute_info(date_str: str) -> Optional[Dict[str, Any]]:
+    return _lookup.get(date_str)
+
 def get_holiday_info(date_str: str) -> Dict[str, Any]:
-    with _df_lock:
-        if df is None or df.empty:
-            raise RuntimeError("数据未初始化或为空")
-        try:
-            _ = datetime.strptime(date_str, "%Y-%m-%d")
-        except ValueError:
-            raise ValueError("日期格式错误，应为 YYYY-MM-DD")
-        if date_str not in df.index:
-            raise KeyError(f"{date_str} 不在支持范围内")
-        row = df.loc[date_str]
-        return {
-            "date": date_str,
-            "weekday": str(row["weekday"]),
-            "is_off_day": bool(row["is_off_day"]),
-            "type": str(row["type"]),
-            "festival": str(row["festival"]),
-            "raw_name": str(row["raw_name"]),
-            "year": int(row["year"]),
-        }
+    # 读路径无锁：全局引用由写方整体换绑，本地快照一次即自洽
+    if not _lookup:
+        raise RuntimeError("数据未初始化或为空")
+    if not _DATE_RE.match(date_str):
+        raise ValueError("日期格式错误，应为 YYYY-MM-DD")
+    info = _compute_info(date_str)
+    if info is None:
+        raise KeyError(f"{date_str} 不在支持范围内")
+    return info
 
 # ===================== 初始化 & 定时刷新 =====================
-def scheduled_refresh():
+async def scheduled_refresh():
+    # AsyncIOScheduler 直接在 uvicorn 的事件循环上触发，无需线程桥接
     try:
-        print("⏳ 定时刷新开始...")
-        changed = fetch_all_year_jsons(force=False)
+        log.info("定时刷新开始...")
+        changed = await fetch_all_year_jsons(force=False)
         if changed:
-            print("✅ 有更新，重建 DataFrame")
-            df_local = build_dataframe()
-            with _df_lock:
-                global df
-                df = df_local
+            log.info("有更新，重建查询表")
+            state = await asyncio.to_thread(build_lookup)
+            _save_lookup_cache(state)
+            _swap_data(state)
         else:
-            print("ℹ️ 无更新，保持现有数据")
-    except Exception as e:
-        print(f"❌ 定时刷新失败：{e}")
+            log.info("无更新，保持现有数据")
+    except Exception:
+        log.exception("定时刷新失败")
 
-def _init_data() -> None:
+async def _init_data() -> None:
     Path(FOLDER_PATH).mkdir(parents=True, exist_ok=True)
     try:
-        changed = fetch_all_year_jsons(force=False)
-        print("✅ JSON 已更新/新增。" if changed else "ℹ️ 使用本地缓存或无变化。")
-    except Exception as e:
-        print(f"❌ 拉取 JSON 失败（将仅使用本地已有文件）：{e}")
-
-    df_local = build_dataframe()
-    with _df_lock:
-        global df
-        df = df_local
+        changed = await fetch_all_year_jsons(force=False)
+        log.info("JSON 已更新/新增。" if changed else "使用本地缓存或无变化。")
+    except Exception:
+        log.exception("拉取 JSON 失败（将仅使用本地已有文件）")
+
+    state = _load_lookup_cache()
+    if state is not None:
+        log.info("命中查询表磁盘缓存，跳过重建")
+    else:
+        state = build_lookup()
+        _save_lookup_cache(state)
+    _swap_data(state)
 
-    if df_local.empty:
-        print("⚠️ 未加载到任何年份的数据（目录为空或下载失败）。服务可用，但查询大概率 404。")
+    if not _lookup:
+        log.warning("未加载到任何年份的数据（目录为空或下载失败）。服务可用，但查询大概率 404。")
     else:
-        print(f"✅ 数据就绪，覆盖年份：{df['year'].min()} ~ {df['year'].max()}")
+        log.info("数据就绪，覆盖年份：%s ~ %s", _year_min, _year_max)
 
 # ===================== Lifespan =====================
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    _init_data()
+    if not log.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s"))
+        log.addHandler(handler)
+    await _init_data()
     scheduler.add_job(scheduled_refresh, "cron", hour=SCHED_HOUR, minute=SCHED_MIN)
     scheduler.start()
-    print(f"🕒 已启动每日定时刷新：{SCHED_TZ} {SCHED_HOUR:02d}:{SCHED_MIN:02d}")
+    log.info("已启动每日定时刷新：%s %02d:%02d", SCHED_TZ, SCHED_HOUR, SCHED_MIN)
     try:
         yield
     finally:
         scheduler.shutdown()
+        await _close_aio_session()
 
 # ===================== 应用 & 路由 =====================
-app = FastAPI(lifespan=lifespan)
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # 静态目录挂到 /ui，根路径 / 重定向到 /ui/
 if STATIC_DIR.is_dir():
@@ -356,25 +585,22 @@ if STATIC_DIR.is_dir():
     def index():
         return RedirectResponse(url="/ui/")
 else:
-    print(f"⚠️ 静态目录未找到：{STATIC_DIR}")
+    log.warning("静态目录未找到：%s", STATIC_DIR)
 
 class QueryBody(BaseModel):
     date: str
 
 @app.get("/health")
 def health():
-    with _df_lock:
-        ready = (df is not None) and (not df.empty)
-    return {"ok": ready, "data_dir": FOLDER_PATH}
+    return {"ok": bool(_lookup), "data_dir": FOLDER_PATH}
 
 @app.get("/refresh")
-def refresh(force: bool = Query(False, description="是否强制重新下载所有 JSON（忽略 sha）")):
+async def refresh(force: bool = Query(False, description="是否强制重新下载所有 JSON（忽略 sha）")):
     try:
-        changed = fetch_all_year_jsons(force=force)
-        df_local = build_dataframe()
-        with _df_lock:
-            global df
-            df = df_local
+        changed = await fetch_all_year_jsons(force=force)
+        state = await asyncio.to_thread(build_lookup)
+        _save_lookup_cache(state)
+        _swap_data(state)
         return {"ok": True, "download_changed": changed}
     except Exception as e:
         return JSONResponse(status_code=500, content={"ok": False, "error": str(e)})